@@ -1,9 +1,9 @@
 import argparse
 import asyncio
+import hashlib
 import os
 import pathlib
 import shutil
-import stat
 import subprocess
 import tempfile
 
@@ -19,7 +19,7 @@ from textual.containers import (
 )
 from textual.message import Message
 from textual.screen import Screen
-from textual.timer import Timer
+from textual.worker import WorkerError
 from textual.widgets import (
     Button,
     Collapsible,
@@ -28,11 +28,13 @@ from textual.widgets import (
     Input,
     Label,
     Markdown,
+    RichLog,
     Static,
     TabbedContent,
     TabPane,
     TextArea,
 )
+from PIL import Image
 from textual_fspicker import FileOpen
 from textual_image.widget import AutoImage
 from watchdog.events import FileSystemEventHandler
@@ -47,6 +49,14 @@ class FileModified(Message):
         super().__init__()
 
 
+# Message sent when a file has been closed after being written
+# (IN_CLOSE_WRITE on Linux).
+class FileClosed(Message):
+    def __init__(self, path: str) -> None:
+        self.path = path
+        super().__init__()
+
+
 # Create a Watchdog event handler that sends
 # Textual messages when a file modied event is recieved.
 class TexualFileSystemEventHandler(FileSystemEventHandler):
@@ -56,6 +66,9 @@ class TexualFileSystemEventHandler(FileSystemEventHandler):
     def on_modified(self, event):
         self.app.post_message(FileModified(event.src_path))
 
+    def on_closed(self, event):
+        self.app.post_message(FileClosed(event.src_path))
+
 
 class SaveScreen(Screen):
     DEFAULT_CSS = """
@@ -92,9 +105,27 @@ width: auto;
 }
 """
 
-    def __init__(self, title, cmd_text, script_text, id):
+    # Marker used on the first line of a command script to request that the
+    # command be kept running as a persistent worker instead of being exec'd
+    # once per update. The piped worker protocol (set output / print
+    # sentinel) is gnuplot syntax, so only `#!repl gnuplot` is honored.
+    REPL_MARKER = "#!repl"
+    REPL_SENTINEL = "__EVIEW_DONE__"
+
+    # Marker placed near the top of a command script to indicate that it
+    # reads the script from stdin instead of opening the script file. Such
+    # commands are passed only the graphic file path.
+    STDIN_MARKER = "#!stdin"
+
+    # Number of previously rendered graphics kept on disk so that toggling
+    # between recent edits re-displays a cached image without re-running the
+    # command.
+    GRAPHIC_CACHE_SIZE = 8
+
+    def __init__(self, title, cmd_text, script_text, id, scratch_root, direct_argv=None):
         super().__init__(title, id=id)
-        self.scratch_dir = pathlib.Path(tempfile.mkdtemp())
+        self.scratch_dir = pathlib.Path(scratch_root) / id
+        self.scratch_dir.mkdir(exist_ok=True)
         self.cmd_file = self.scratch_dir / "run"
         self.script_file = self.scratch_dir / "in.txt"
         self.graphic_file = self.scratch_dir / "out.png"
@@ -102,109 +133,183 @@ width: auto;
         self.cmd_text = cmd_text
         self.script_text = script_text
 
-    def __del__(self):
-        if self.scratch_dir.exists():
-            shutil.rmtree(self.scratch_dir)
+        # an argv template with {in}/{out} placeholders that is exec'd
+        # directly (no shell wrapper) as long as the command script is left
+        # at its default text
+        self.direct_argv = direct_argv
+        self._default_cmd_text = cmd_text
+
+        self._worker_proc = None
+        self._worker_argv = None
+        self._worker_timeout = 5
+
+        self._last_hash = None
+        self._graphic_cache = {}
+        self._last_graphic_sig = None
+
+        # contents last written to disk, so unchanged text skips the
+        # truncate+rewrite (and the chmod for the cmd file)
+        self._cmd_on_disk = None
+        self._script_on_disk = None
+
+        # snapshot the environment once instead of letting subprocess copy
+        # os.environ on every spawn
+        self._env = os.environ.copy()
+        self._update_paths()
+
+        self._file_setters = {
+            "script-file-input": self.set_script_file,
+            "cmd-file-input": self.set_cmd_file,
+            "graphic-file-input": self.set_graphic_file,
+        }
 
-    def compose(self):
         self._debounce_time = 0.5
-        self._debounce_timer: Timer | None = None
-        with Collapsible(title="Command"):
-            yield TextArea.code_editor(text="", id="cmd-window")
-
-        with Horizontal():
-            with Vertical():
-                yield Label("Script")
-                yield TextArea.code_editor(id="script-window")
-                with VerticalGroup():
-                    yield Static(f"Scratch Directory: {self.scratch_dir}")
-                    yield Static(
-                        f"Current Working Directory: {pathlib.Path('.').absolute()}"
-                    )
-                with VerticalGroup():
-                    yield Label(
-                        "Script File",
-                    )
-                    yield Input(id="script-file-input")
-                with VerticalGroup():
-                    yield Label(
-                        "Graphic File",
-                    )
-                    yield Input(id="graphic-file-input")
-                with VerticalGroup():
-                    yield Label(
-                        "Command File",
-                    )
-                    yield Input(id="cmd-file-input")
-            with VerticalGroup():
-                yield Label("Graphic")
-                yield AutoImage(id="graphic-window")
-                yield Label("Output")
-                yield TextArea(id="output-window")
+        self._built = False
 
-    def on_mount(self):
-        self._debounce_timer = Timer(
-            self, self._debounce_time, callback=self.generate_graphic
+    def _ensure_built(self):
+        # Build the tab's widgets the first time the tab is shown, so startup
+        # only constructs the visible tab. The widgets are created directly
+        # and kept as attributes instead of being re-queried from the DOM.
+        if self._built:
+            return
+        self._built = True
+
+        self._cmd_window = TextArea.code_editor(text=self.cmd_text, id="cmd-window")
+        self._script_window = TextArea.code_editor(
+            text=self.script_text, id="script-window"
+        )
+        self._output_window = RichLog(id="output-window", max_lines=500)
+        self._graphic_window = AutoImage(id="graphic-window")
+        self._script_file_input = Input(
+            value=self._script_file_s, id="script-file-input"
+        )
+        self._graphic_file_input = Input(
+            value=self._graphic_file_s, id="graphic-file-input"
+        )
+        self._cmd_file_input = Input(value=self._cmd_file_s, id="cmd-file-input")
+
+        self._script_file_input.tooltip = "Name of the file that the script will be written to. By default, the script will be written to a temporary directory, but this can be changed to load and save from a different location."
+        self._graphic_file_input.tooltip = "Name of the image file that will be generated."
+        self._cmd_file_input.tooltip = "Name of the command script (the script that generates the image file from the script file) that will be written and excecuted to process the script and generate the image file."
+
+        self._cmd_window.tooltip = "This script is used to process the input script and produce the graphic file. It will be passed two arguments. The first argument is the name of the input script, eview writes and updates then file as the user edits the script. The second argument is the name of the graphic file that should be generated."
+        self._script_window.tooltip = "Edit the input script here. This script will be saved and processed to generate the graphic file."
+
+        self.mount(
+            Collapsible(self._cmd_window, title="Command"),
+            Horizontal(
+                Vertical(
+                    Label("Script"),
+                    self._script_window,
+                    VerticalGroup(
+                        Static(f"Scratch Directory: {self.scratch_dir}"),
+                        Static(
+                            f"Current Working Directory: {pathlib.Path('.').absolute()}"
+                        ),
+                    ),
+                    VerticalGroup(
+                        Label(
+                            "Script File",
+                        ),
+                        self._script_file_input,
+                    ),
+                    VerticalGroup(
+                        Label(
+                            "Graphic File",
+                        ),
+                        self._graphic_file_input,
+                    ),
+                    VerticalGroup(
+                        Label(
+                            "Command File",
+                        ),
+                        self._cmd_file_input,
+                    ),
+                ),
+                VerticalGroup(
+                    Label("Graphic"),
+                    self._graphic_window,
+                    Label("Output"),
+                    self._output_window,
+                ),
+            ),
         )
 
-        self.query_one("#cmd-window").text = self.cmd_text
-        self.query_one("#script-window").text = self.script_text
-        self.query_one("#script-file-input").value = str(self.script_file)
-        self.query_one("#graphic-file-input").value = str(self.graphic_file)
-        self.query_one("#cmd-file-input").value = str(self.cmd_file)
-        self.query_one(
-            "#script-file-input"
-        ).tooltip = "Name of the file that the script will be written to. By default, the script will be written to a temporary directory, but this can be changed to load and save from a different location."
-        self.query_one(
-            "#graphic-file-input"
-        ).tooltip = "Name of the image file that will be generated."
-        self.query_one(
-            "#cmd-file-input"
-        ).tooltip = "Name of the command script (the script that generates the image file from the script file) that will be written and excecuted to process the script and generate the image file."
-
-        self.query_one(
-            "#cmd-window"
-        ).tooltip = "This script is used to process the input script and produce the graphic file. It will be passed two arguments. The first argument is the name of the input script, eview writes and updates then file as the user edits the script. The second argument is the name of the graphic file that should be generated."
-        self.query_one(
-            "#script-window"
-        ).tooltip = "Edit the input script here. This script will be saved and processed to generate the graphic file."
-
-        self._script_file_change_handler = TexualFileSystemEventHandler(self)
-        self._script_file_observer = Observer()
-        self._script_file_observer.start()
+    def on_mount(self):
+        self._dirty = asyncio.Event()
+        self._debounce_task = asyncio.create_task(self._debounce_loop())
+
+        self._file_change_handler = TexualFileSystemEventHandler(self)
+        self._file_observer = Observer()
+        self._file_observer.start()
         self._script_file_write = True
 
+        # watch the scratch dir so the close-write event for the graphic
+        # file tells us it is complete
+        self._graphic_written_sig = None
+        self._file_observer.schedule(self._file_change_handler, str(self.scratch_dir))
+
     def on_unmount(self):
-        self._script_file_observer.stop()
-        self._script_file_observer.join()
+        self._stop_worker()
+        self._debounce_task.cancel()
+        self._file_observer.stop()
+        self._file_observer.join()
 
     def on_show(self):
-        self._debounce_timer._start()
+        self._ensure_built()
+        self._schedule_generate()
+
+    def _schedule_generate(self):
+        # a change is just one Event.set; all the pacing lives in the loop
+        self._dirty.set()
+
+    async def _debounce_loop(self):
+        # Dirty-flag state machine: the worker sleeps one debounce period
+        # after a change and starts over if another change arrived while it
+        # slept, so the command runs only once the edits go quiet and edit
+        # bursts cost no clock reads or timer management at all.
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            await asyncio.sleep(self._debounce_time)
+            if self._dirty.is_set():
+                continue
+            try:
+                await self.generate_graphic().wait()
+            except WorkerError as e:
+                # one failed or cancelled render must not kill this task and
+                # leave the tab permanently unresponsive
+                self._set_output("Failed!" + "\n\n" + str(e))
 
     def on_file_modified(self, message: FileModified):
-        if message.path == str(self.script_file.absolute()):
+        if message.path == self._script_file_abs_s:
             self._script_file_write = False
             self._load_script_text()
 
-    @on(Input.Blurred, "#script-file-input")
-    @on(Input.Submitted, "#script-file-input")
-    def _set_script_file(self, event):
-        self.set_script_file(event.input.value)
-
-    @on(Input.Blurred, "#cmd-file-input")
-    @on(Input.Submitted, "#cmd-file-input")
-    def _set_cmd_file(self, event):
-        self.set_cmd_file(event.input.value)
-
-    @on(Input.Blurred, "#graphic-file-input")
-    @on(Input.Submitted, "#graphic-file-input")
-    def _set_graphic_file(self, event):
-        self.set_graphic_file(event.input.value)
+    def on_file_closed(self, message: FileClosed):
+        if message.path == self._graphic_file_abs_s:
+            # record the on-disk signature at close-write time so it stays
+            # comparable with the stat-based signatures taken elsewhere
+            try:
+                st = self.graphic_file.stat()
+            except OSError:
+                return
+            self._graphic_written_sig = (st.st_mtime_ns, st.st_size)
+
+    @on(Input.Blurred)
+    @on(Input.Submitted)
+    def _set_file(self, event):
+        # one handler dispatching on the input id instead of three handlers
+        # with two selector registrations each
+        setter = self._file_setters.get(event.input.id)
+        if setter is not None:
+            setter(event.input.value)
 
     def _load_script_text(self):
         if self.script_file.exists():
             self.script_text = self.script_file.read_text()
-        self.query_one("#script-window").text = self.script_text
+            self._script_on_disk = self.script_text
+        self._script_window.text = self.script_text
 
     def set_script_file(self, filename):
         self.script_file = pathlib.Path(filename)
@@ -212,12 +317,15 @@ width: auto;
             self.script_file.write_text(self.script_text)
         else:
             self.script_text = self.script_file.read_text()
-        self.query_one("#script-window").text = self.script_text
-        self.query_one("#script-file-input").value = str(self.script_file)
-        self._debounce_timer.reset()
-
-        self._script_file_observer.schedule(
-            self._script_file_change_handler, self.script_file.parent
+        self._script_on_disk = self.script_text
+        self._last_hash = None
+        self._update_paths()
+        self._script_window.text = self.script_text
+        self._script_file_input.value = self._script_file_s
+        self._schedule_generate()
+
+        self._file_observer.schedule(
+            self._file_change_handler, self.script_file.parent
         )
 
     def set_cmd_file(self, filename):
@@ -226,16 +334,30 @@ width: auto;
             self.cmd_file.write_text(self.cmd_text)
         else:
             self.cmd_text = self.cmd_file.read_text()
-        self.query_one("#cmd-window").text = self.cmd_text
-        self.query_one("#cmd-file-input").value = str(self.cmd_file)
-        self._debounce_timer.reset()
+        # the new file has not been made executable yet
+        self._cmd_on_disk = None
+        self._last_hash = None
+        self._update_paths()
+        self._cmd_window.text = self.cmd_text
+        self._cmd_file_input.value = self._cmd_file_s
+        self._schedule_generate()
 
     def set_graphic_file(self, filename):
         self.graphic_file = pathlib.Path(filename)
-        self.query_one("#graphic-file-input").value = str(self.graphic_file)
-        self._debounce_timer.reset()
+        self._last_hash = None
+        self._last_graphic_sig = None
+        self._graphic_written_sig = None
+        self._update_paths()
+        self._file_observer.schedule(
+            self._file_change_handler, self.graphic_file.parent
+        )
+        self._graphic_file_input.value = self._graphic_file_s
+        self._schedule_generate()
 
     def set_files(self, script_filename):
+        # may be called before the tab has ever been shown (e.g. for a
+        # filename given on the command line)
+        self._ensure_built()
         script_file = pathlib.Path(script_filename)
         cmd_file = script_file.with_suffix(".run")
         graphic_file = script_file.with_suffix(".png")
@@ -244,68 +366,330 @@ width: auto;
         self.set_cmd_file(cmd_file)
         self.set_graphic_file(graphic_file)
 
+    def _set_output(self, text):
+        # RichLog appends in O(lines written); assigning TextArea.text forced
+        # a full document re-parse and re-layout for every update
+        self._output_window.clear()
+        if text:
+            self._output_window.write(text)
+
     def set_graphic(self, file):
-        self.query_one("#graphic-window").image = file
+        self._graphic_window.image = file
 
     @on(TextArea.Changed, "#script-window")
     @on(TextArea.Changed, "#cmd-window")
     def reset_debounce_timer(self, event):
-        self._debounce_timer.reset()
+        self._schedule_generate()
+
+    def _repl_argv(self):
+        # Command scripts that start with the REPL marker name a program that
+        # reads commands from stdin (e.g. `#!repl gnuplot`). These are kept
+        # running between updates to avoid paying fork+exec+startup cost on
+        # every keystroke burst. The commands piped into the worker are
+        # gnuplot syntax, so the marker is ignored for any other program
+        # rather than feeding it commands it cannot answer.
+        first_line = self.cmd_text.split("\n", 1)[0].strip()
+        if first_line.startswith(self.REPL_MARKER):
+            argv = first_line[len(self.REPL_MARKER) :].split()
+            if argv and pathlib.PurePath(argv[0]).name == "gnuplot":
+                return argv
+        return None
+
+    @staticmethod
+    def _atomic_write(path, data, mode=None):
+        # write-to-temp + rename so a child that is still reading (or
+        # executing) the previous version never sees a truncated file; the
+        # temp name keeps the full filename so siblings that differ only in
+        # suffix (plot.run vs plot.gp) never stage to the same temp file
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+
+    def _update_paths(self):
+        # str and argv forms of the current paths, rebuilt when one of the
+        # files changes rather than str()-ing the Paths on every render or
+        # observer event
+        self._script_file_s = str(self.script_file)
+        self._cmd_file_s = str(self.cmd_file)
+        self._graphic_file_s = str(self.graphic_file)
+        self._script_file_abs_s = str(self.script_file.absolute())
+        self._graphic_file_abs_s = str(self.graphic_file.absolute())
+        cmd = os.fsencode(self.cmd_file.absolute())
+        self._argv = (
+            cmd,
+            os.fsencode(self.script_file),
+            os.fsencode(self.graphic_file),
+        )
+        self._stdin_argv = (cmd, os.fsencode(self.graphic_file))
+
+    def _wants_stdin(self):
+        return any(
+            line.strip() == self.STDIN_MARKER
+            for line in self.cmd_text.split("\n", 3)[:3]
+        )
+
+    def _stop_worker(self):
+        if self._worker_proc is not None and self._worker_proc.returncode is None:
+            self._worker_proc.kill()
+        self._worker_proc = None
+        self._worker_argv = None
+
+    async def _ensure_worker(self, argv):
+        if self._worker_proc is not None:
+            if self._worker_proc.returncode is None and self._worker_argv == argv:
+                return self._worker_proc
+            self._stop_worker()
+        self._worker_proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        self._worker_argv = argv
+        return self._worker_proc
+
+    async def _run_in_worker(self, argv):
+        # Pipe the script into the persistent worker followed by a sentinel
+        # print, and collect output until the sentinel comes back.
+        proc = await self._ensure_worker(argv)
+        script = "\n".join(
+            [
+                # the worker keeps running between renders, so wipe settings
+                # and user-defined variables/functions left by the previous
+                # script; otherwise the preview diverges from a fresh run
+                "reset session",
+                "set term png",
+                f"set output '{self._graphic_file_s}'",
+                self.script_text,
+                "unset output",
+                f'print "{self.REPL_SENTINEL}"',
+                "",
+            ]
+        )
+        proc.stdin.write(script.encode())
+        await proc.stdin.drain()
+        lines = []
+        while True:
+            line = await asyncio.wait_for(
+                proc.stdout.readline(), timeout=self._worker_timeout
+            )
+            if not line:
+                # worker died, restart on the next update
+                self._stop_worker()
+                break
+            if line.strip().decode(errors="replace") == self.REPL_SENTINEL:
+                break
+            lines.append(line.decode(errors="replace"))
+        return "".join(lines)
 
     @work()
     async def generate_graphic(self):
-        self._debounce_timer.pause()
-
-        self.script_text = self.query_one("#script-window").text
+        self.script_text = self._script_window.text
         if self.script_text == "":
             return
 
-        self.cmd_text = self.query_one("#cmd-window").text
-
-        self.cmd_file.write_text(self.cmd_text)
-        os.chmod(self.cmd_file, stat.S_IXUSR | stat.S_IRUSR | stat.S_IWUSR)
-        if self._script_file_write:
-            self.script_file.write_text(self.script_text)
+        self.cmd_text = self._cmd_window.text
+
+        # encode each text once per edit-burst; the hash, the file writes and
+        # the stdin pipe below all share these buffers
+        self._script_bytes = self.script_text.encode()
+        self._cmd_bytes = self.cmd_text.encode()
+
+        # A 16 byte compare replaces a subprocess run + file writes + image
+        # reload when the edits ultimately produced identical text (type+undo,
+        # cursor motion, etc.). The graphic path is part of the identity so a
+        # new output location always triggers a fresh run.
+        h = hashlib.blake2b(
+            self._cmd_bytes
+            + b"\x00"
+            + self._script_bytes
+            + b"\x00"
+            + self._graphic_file_s.encode(),
+            digest_size=16,
+        ).digest()
+        if h == self._last_hash:
+            return
+        cached = self._graphic_cache.get(h)
+        if cached is not None and cached.exists():
+            try:
+                img = await asyncio.get_event_loop().run_in_executor(
+                    None, self._load_graphic, str(cached)
+                )
+            except Exception:
+                # a cached file that no longer decodes is dropped and the
+                # command re-run instead
+                self._graphic_cache.pop(h, None)
+            else:
+                # re-insert to keep the cache ordered by most recent use
+                self._graphic_cache[h] = self._graphic_cache.pop(h)
+                self._last_hash = h
+                # replace the transcript too; the restored graphic must not
+                # sit next to stdout from an unrelated earlier run
+                with self.app.batch_update():
+                    self._set_output("(cached)")
+                    self._graphic_window.image = img
+                return
+
+        if self.cmd_text != self._cmd_on_disk:
+            self._atomic_write(self.cmd_file, self._cmd_bytes, mode=0o700)
+            self._cmd_on_disk = self.cmd_text
+        if self._script_file_write and self.script_text != self._script_on_disk:
+            self._atomic_write(self.script_file, self._script_bytes)
+            self._script_on_disk = self.script_text
         self._script_file_write = True
-        self.set_graphic(None)
-        self.query_one("#output-window").text = "Running..."
+        self._graphic_written_sig = None
+        self._set_output("Running...")
+        repl_argv = self._repl_argv()
+        returncode = 1
         try:
-            proc = await asyncio.create_subprocess_exec(
-                str(self.cmd_file.absolute()),
-                str(self.script_file),
-                str(self.graphic_file),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT,
+            if repl_argv is not None:
+                stdout_text = await self._run_in_worker(repl_argv)
+                returncode = 0 if self._worker_proc is not None else 1
+            else:
+                # close_fds=False skips the close-every-fd walk in the child
+                # before exec; eview holds no sensitive fds
+                if (
+                    self.direct_argv is not None
+                    and self.cmd_text == self._default_cmd_text
+                ):
+                    # the default command is a thin wrapper around a single
+                    # program; exec it directly and skip the bash fork+exec
+                    argv = [
+                        a.format_map(
+                            {"in": self._script_file_s, "out": self._graphic_file_s}
+                        )
+                        for a in self.direct_argv
+                    ]
+                    proc = await asyncio.create_subprocess_exec(
+                        *argv,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.STDOUT,
+                        close_fds=False,
+                        env=self._env,
+                    )
+                elif self._wants_stdin():
+                    # the wrapper reads the script from stdin, saving the
+                    # child an open+read of the script file
+                    proc = await asyncio.create_subprocess_exec(
+                        *self._stdin_argv,
+                        stdin=asyncio.subprocess.PIPE,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.STDOUT,
+                        close_fds=False,
+                        env=self._env,
+                    )
+                    proc.stdin.write(self._script_bytes)
+                    await proc.stdin.drain()
+                    proc.stdin.close()
+                else:
+                    proc = await asyncio.create_subprocess_exec(
+                        *self._argv,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.STDOUT,
+                        close_fds=False,
+                        env=self._env,
+                    )
+                # stream chunks into one reusable buffer rather than letting
+                # communicate() build and join N intermediate bytes objects
+                buf = bytearray()
+                while chunk := await proc.stdout.read(65536):
+                    buf.extend(chunk)
+                await proc.wait()
+                stdout_text = buf.decode("utf-8", errors="replace") if buf else ""
+                returncode = proc.returncode
+        except TimeoutError:
+            self._stop_worker()
+            self._set_output(
+                f"Failed!\n\nWorker did not respond within {self._worker_timeout}s and was restarted."
             )
-            stdout, _ = await proc.communicate()
-            self.query_one("#output-window").text = stdout.decode()
+            return
         except subprocess.CalledProcessError as e:
-            self.query_one("#output-window").text = "Failed!" + "\n\n" + str(e)
+            self._set_output("Failed!" + "\n\n" + str(e))
             pass
         except Exception as e:
-            self.query_one("#output-window").text = "Failed!" + "\n\n" + str(e)
+            self._set_output("Failed!" + "\n\n" + str(e))
             return
 
-        if (
-            proc.returncode == 0
-            and self.graphic_file.exists()
-            and os.path.getsize(self.graphic_file) > 0
-        ):
-            try:
-                self.query_one("#graphic-window").image = str(self.graphic_file)
-            except:
-                pass
+        if returncode == 0 and (sig := self._graphic_sig()) is not None:
+            img = None
+            if sig != self._last_graphic_sig:
+                try:
+                    # decode in a thread so libpng work doesn't stall the
+                    # event loop while the user is typing
+                    img = await asyncio.get_event_loop().run_in_executor(
+                        None, self._load_graphic, self._graphic_file_s
+                    )
+                except:
+                    pass
+            # one batched render pass for the output text and the new image
+            with self.app.batch_update():
+                self._set_output(stdout_text)
+                if img is not None:
+                    self._last_graphic_sig = sig
+                    self._graphic_window.image = img
+            if img is not None:
+                # remember (and cache) only runs whose freshly written
+                # graphic decoded successfully, so failures are retried and
+                # a stale or broken output is never re-displayed from cache
+                self._last_hash = h
+                self._cache_graphic(h)
         else:
-            pass
+            self._set_output(stdout_text)
+
+    def _graphic_sig(self):
+        # The observer's close-write event tells us the graphic file was
+        # freshly written and is complete; it recorded a (mtime, size)
+        # signature at close time. When no event was delivered (non-inotify
+        # platforms, or it is still in flight) fall back to stat'ing the
+        # file. Either way the signature is a (mtime, size) tuple so it
+        # stays comparable across runs: an unchanged signature means the
+        # file was not rewritten and the current image can be kept — in
+        # particular a REPL script error that left the old graphic untouched
+        # is not mistaken for a fresh render. Returns None when there is no
+        # usable graphic.
+        if self._graphic_written_sig is not None:
+            sig = self._graphic_written_sig
+            self._graphic_written_sig = None
+            return sig
+        try:
+            st = self.graphic_file.stat()
+        except OSError:
+            return None
+        if st.st_size == 0:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _load_graphic(path):
+        img = Image.open(path)
+        img.load()
+        return img
+
+    def _cache_graphic(self, h):
+        cache_file = self.scratch_dir / f"cache-{h.hex()}.png"
+        try:
+            shutil.copyfile(self.graphic_file, cache_file)
+        except OSError:
+            return
+        self._graphic_cache[h] = cache_file
+        while len(self._graphic_cache) > self.GRAPHIC_CACHE_SIZE:
+            oldest = next(iter(self._graphic_cache))
+            self._graphic_cache.pop(oldest).unlink(missing_ok=True)
 
 
 class Viewers:
     class gnuplot:
-        cmd = r"""#! /bin/bash
-
-INPUT=${1:-$(basename ${0} .run).gnuplot}
-OUTPUT=${2:-$(basename ${0} .run).png}
-timeout 1 gnuplot -e "set term png; set output '${OUTPUT}'; load '${INPUT}'" || echo "`gnuplot` command timed out after 1. You can increase the timeout time in the run script."
+        cmd = r"""#!repl gnuplot
+# A single gnuplot process is kept running and each update is piped into it,
+# so there is no process startup cost per render. The #!repl marker only
+# works with gnuplot. Replace the first line with a normal script
+# (e.g. #! /bin/bash) to run a command once per update instead:
+#
+# INPUT=${1:-$(basename ${0} .run).gnuplot}
+# OUTPUT=${2:-$(basename ${0} .run).png}
+# timeout 1 gnuplot -e "set term png; set output '${OUTPUT}'; load '${INPUT}'"
 """
         script = r"""
 plot sin(x)
@@ -313,6 +697,9 @@ plot sin(x)
 
     class tex2im:
         class math:
+            # exec'd directly while the command script below is unedited,
+            # skipping the bash wrapper
+            argv = ("tex2im", "{in}", "-o", "{out}")
             cmd = r"""#! /bin/bash
 # some useful options
 # -B INT : set border width in pixels
@@ -330,6 +717,9 @@ tex2im "${INPUT}" -o "${OUTPUT}"
 """
 
         class tikz:
+            # exec'd directly while the command script below is unedited,
+            # skipping the bash wrapper
+            argv = ("tex2im", "-n", "-B", "10", "{in}", "-o", "{out}")
             cmd = r"""#! /bin/bash
 # some useful options
 # -B INT : set border width in pixels
@@ -364,11 +754,14 @@ y = mx + b
 
     class custom:
         cmd = r"""#! /bin/bash
-SCRIPT_FILE=${1}
-GRAPHIC_FILE=${2}
+#!stdin
+# The #!stdin marker above means the script is piped into this command on
+# stdin and only the graphic filename is passed as an argument. Remove it to
+# receive the script filename as ${1} and the graphic filename as ${2}.
+GRAPHIC_FILE=${1}
 # Insert command that will create an image named ${GRAPHIC_FILE}
-# This example runs script file as a bash script passing the graphics filename as an argument.
-bash ${SCRIPT_FILE} ${GRAPHIC_FILE}
+# This example runs the script from stdin as a bash script passing the graphics filename as an argument.
+bash -s ${GRAPHIC_FILE}
 """
         script = r"""
 # Edit command script to process this file and then edit this file.
@@ -408,55 +801,46 @@ class EviewApp(App):
     def __init__(self, filename):
         super().__init__()
         self.filename = pathlib.Path(filename) if filename is not None else None
+        # one scratch directory shared by every tab; each AppTab gets a
+        # subdirectory named after its id
+        self.scratch_root = pathlib.Path(tempfile.mkdtemp(prefix="eview-"))
+
+    def on_unmount(self):
+        shutil.rmtree(self.scratch_root, ignore_errors=True)
+
+    # Drives compose: a viewer class produces an AppTab, a tuple of
+    # (name, viewer) pairs produces a nested tab group.
+    TABS = (
+        ("gnuplot", Viewers.gnuplot),
+        ("tex2im", (("math", Viewers.tex2im.math), ("tikz", Viewers.tex2im.tikz))),
+        ("python", (("matplotlib", Viewers.python.matplotlib),)),
+        ("typst", Viewers.typst),
+        ("custom", Viewers.custom),
+    )
+
+    def _make_tab(self, title, id, viewer):
+        return AppTab(
+            title,
+            viewer.cmd,
+            viewer.script,
+            id=id,
+            scratch_root=self.scratch_root,
+            direct_argv=getattr(viewer, "argv", None),
+        )
 
     def compose(self):
-        self._debounce_time = 0.5
-        self._debounce_timer: Timer | None = None
         yield Header()
         with TabbedContent(id="main-tab-group"):
-            with AppTab(
-                "gnuplot", Viewers.gnuplot.cmd, Viewers.gnuplot.script, id="gnuplot-tab"
-            ):
-                pass
-            with TabPane("tex2im", id="tex2im-tab"):
-                with TabbedContent(id="tex2im-tab-group") as tc:
-                    with AppTab(
-                        "math",
-                        Viewers.tex2im.math.cmd,
-                        Viewers.tex2im.math.script,
-                        id="tex2im-math-tab",
-                    ):
-                        pass
-                    with AppTab(
-                        "tikz",
-                        Viewers.tex2im.tikz.cmd,
-                        Viewers.tex2im.tikz.script,
-                        id="tex2im-tikz-tab",
-                    ):
-                        pass
-            with TabPane("python", id="python-tab"):
-                with TabbedContent(id="python-tab-group") as tc:
-                    with AppTab(
-                        "matplotlib",
-                        Viewers.python.matplotlib.cmd,
-                        Viewers.python.matplotlib.script,
-                        id="python-matplotlib-tab",
-                    ):
-                        pass
-            with AppTab(
-                "typst",
-                Viewers.typst.cmd,
-                Viewers.typst.script,
-                id="typst-tab",
-            ):
-                pass
-            with AppTab(
-                "custom",
-                Viewers.custom.cmd,
-                Viewers.custom.script,
-                id="custom-tab",
-            ):
-                pass
+            for name, entry in self.TABS:
+                if isinstance(entry, tuple):
+                    with TabPane(name, id=f"{name}-tab"):
+                        with TabbedContent(id=f"{name}-tab-group"):
+                            for sub_name, viewer in entry:
+                                yield self._make_tab(
+                                    sub_name, f"{name}-{sub_name}-tab", viewer
+                                )
+                else:
+                    yield self._make_tab(name, f"{name}-tab", entry)
         yield Footer()
 
     def on_mount(self):
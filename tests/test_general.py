@@ -1,12 +1,54 @@
-import pytest
-from pylasercalc.ui import LaserCalcApp
+import asyncio
+import pathlib
 
+from PIL import Image
 
-@pytest.mark.asyncio
-async def test_start_app():
-    app = EviewApp()
+from eview import EviewApp
 
-    async with app.run_test() as pilot:
-        await pilot.press("right")
-        await pilot.press("right")
-        await pilot.press("right")
+
+def test_start_app():
+    async def run():
+        app = EviewApp(None)
+        async with app.run_test() as pilot:
+            await pilot.press("right")
+            await pilot.press("right")
+            await pilot.press("right")
+
+    asyncio.run(run())
+
+
+def test_render_and_change_graphic_file(tmp_path):
+    # end-to-end: the custom tab runs its script, the graphic appears in
+    # the image widget, and pointing the graphic path somewhere new
+    # regenerates the output at the new location
+    src = tmp_path / "src.png"
+    Image.new("RGB", (4, 4), "red").save(src)
+
+    async def wait_for(pilot, cond, timeout=10):
+        for _ in range(int(timeout / 0.1)):
+            await pilot.pause()
+            if cond():
+                return True
+            await asyncio.sleep(0.1)
+        return False
+
+    async def run():
+        app = EviewApp(None)
+        async with app.run_test() as pilot:
+            app.query_one("#main-tab-group").active = "custom-tab"
+            await pilot.pause()
+            tab = app.query_one("#custom-tab")
+            tab._script_window.text = f"cp {src} ${{1}}\n"
+
+            assert await wait_for(
+                pilot, lambda: tab._graphic_window.image is not None
+            ), "first render never produced a graphic"
+            assert tab.graphic_file.exists()
+
+            new_graphic = tmp_path / "moved.png"
+            tab.set_graphic_file(new_graphic)
+            assert await wait_for(
+                pilot, lambda: new_graphic.exists()
+            ), "changing the graphic path did not regenerate the output"
+
+    asyncio.run(run())